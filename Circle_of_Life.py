@@ -4,7 +4,6 @@ This module simulates a simple ecosystem with zebras and lions.
 Zebras eat grass, and lions eat zebras. The simulation runs for a specified number of years, and the state of the ecosystem is displayed at each year.
 
 Classes:
-    Cell: Represents a cell in the ecosystem that can grow grass.
     Animal: Base class for animals in the ecosystem.
     Zebra: A zebra in the ecosystem.
     Lion: A lion in the ecosystem.
@@ -18,6 +17,8 @@ Constants:
     INITIAL_ZEBRAS: The initial number of zebras in the ecosystem.
     INITIAL_LIONS: The initial number of lions in the ecosystem.
     YEARS: The number of years the simulation runs.
+    GRASS, ZEBRA, LION: Bit flags of a cell in the ecosystem state grid;
+        ZEBRA and LION double as the species tags of the animal classes.
 
 """
 import random
@@ -30,27 +31,42 @@ INITIAL_ZEBRAS = 20
 INITIAL_LIONS = 5
 YEARS = 20
 
-class Cell:
-    """A cell in the ecosystem that can grow grass."""
-    def __init__(self):
-        """Initialize a cell with grass."""
-        self.grass = True
-        self.regrow_timer = 0
-
-    def eaten(self):
-        """A zebra eats the grass in this cell."""
-        self.grass = False
-        self.regrow_timer = 1
-
-    def step(self):
-        """Regrow grass if it has been eaten."""
-        if not self.grass:
-            self.regrow_timer -= 1
-            if self.regrow_timer <= 0:
-                self.grass = True
+# Cell state bits; the animal bits double as species tags.
+GRASS = 1
+ZEBRA = 2
+LION = 4
+OCCUPIED = ZEBRA | LION
+
+# Neighbour offsets; bit i of a direction mask stands for _DIRS[i].
+_DIRS = ((-1,0),(1,0),(0,-1),(0,1))
+# Set-bit indices of every 4-bit direction mask.
+_SET_BITS = tuple(tuple(i for i in range(4) if m >> i & 1) for m in range(16))
+# In-bounds neighbours of each cell, row-major: (direction bit, nx, ny, flat index).
+_NBR = tuple(
+    tuple((1 << i, x + dx, y + dy, (y + dy)*GRID_SIZE + x + dx)
+          for i, (dx, dy) in enumerate(_DIRS)
+          if 0 <= x + dx < GRID_SIZE and 0 <= y + dy < GRID_SIZE)
+    for y in range(GRID_SIZE) for x in range(GRID_SIZE))
+# Fixed parts of the display frame.
+_COL_HEAD = '  ' + ''.join(f'{i:3}' for i in range(1, GRID_SIZE+1))
+_SEP = '-' * len(_COL_HEAD)
+_ROW_PREFIX = tuple(f'{y+1:2}|' for y in range(GRID_SIZE))
+# Display glyph for every cell state byte; zebras win a cell shared with a lion.
+_GLYPHS = bytes(ord('Z') if s & ZEBRA else ord('L') if s & LION else ord('.')
+                for s in range(256))
+
+def _pick(mask, rand):
+    """Return the offset of a uniformly chosen direction in mask."""
+    bits = _SET_BITS[mask]
+    return _DIRS[bits[int(rand() * len(bits))]]
 
 class Animal:
     """Base class for animals in the ecosystem."""
+    __slots__ = ('x', 'y', 'age', 'hungry', 'alive')
+    species = None     # ZEBRA or LION state bit.
+    max_hunger = None  # Steps without food that kill the animal.
+    breed_age = None   # Age at which the animal breeds.
+
     def __init__(self, x, y):
         """Initialize an animal at position (x, y)."""
         self.x = x
@@ -61,144 +77,185 @@ class Animal:
 
     def neighbors(self):
         """Yield coordinates of neighboring cells."""
-        for dx, dy in [(-1,0),(1,0),(0,-1),(0,1)]:
-            nx, ny = self.x + dx, self.y + dy
-            if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE:
-                yield nx, ny
+        for _, nx, ny, _ in _NBR[self.y*GRID_SIZE + self.x]:
+            yield nx, ny
 
-    def move(self, ecosys):
-        """Move the animal to a new position."""
+    def move(self, ecosys, rand):
+        """Move the animal to a new position, drawing from rand()."""
         raise NotImplementedError
 
-    def step(self, ecosys, newborns):
+    def step(self, ecosys, newborns, rand):
         """Perform a step in the ecosystem."""
         if not self.alive:
             return
         self.age += 1
-        ate = self.move(ecosys)
+        ate = self.move(ecosys, rand)
         self.hungry = 0 if ate else self.hungry + 1
-        if self.dead():
+        if self.hungry >= self.max_hunger:
             self.alive = False
-            return
-        baby = self.breed()
-        if baby:
-            newborns.append(baby)
-
-    def dead(self):
-        """Check if the animal is dead."""
-        raise NotImplementedError
-
-    def breed(self):
-        """Check if the animal can breed."""
-        raise NotImplementedError
+        elif self.age >= self.breed_age:
+            self.age = 0
+            newborns.append(type(self)(self.x, self.y))
 
 class Zebra(Animal):
     """A zebra in the ecosystem."""
-    def move(self, ecosys):
+    __slots__ = ()
+    species = ZEBRA
+    max_hunger = 3
+    breed_age = 3
+
+    def move(self, ecosys, rand):
         """Move the zebra to a neighboring cell with grass."""
-        grass_cells = [(nx,ny) for nx,ny in self.neighbors()
-                       if ecosys.cells[ny][nx].grass and not ecosys.occupied(nx,ny)]
-        if grass_cells:
-            nx, ny = random.choice(grass_cells)
-            ecosys.move(self, nx, ny)
-            ecosys.cells[ny][nx].eaten()
+        x, y = self.x, self.y
+        state = ecosys.state
+        grass_mask = empty_mask = 0
+        for bit, _, _, j in _NBR[y*GRID_SIZE + x]:
+            cell = state[j]
+            if not cell & OCCUPIED:
+                empty_mask |= bit
+                if cell & GRASS:
+                    grass_mask |= bit
+        if grass_mask:
+            dx, dy = _pick(grass_mask, rand)
+            ecosys.move(self, x + dx, y + dy)
+            ecosys.eat_grass(x + dx, y + dy)
             return True
-        empties = [(nx,ny) for nx,ny in self.neighbors() if not ecosys.occupied(nx,ny)]
-        if empties:
-            nx, ny = random.choice(empties)
-            ecosys.move(self, nx, ny)
+        if empty_mask:
+            dx, dy = _pick(empty_mask, rand)
+            ecosys.move(self, x + dx, y + dy)
         return False
 
-    def dead(self):
-        """Check if the zebra is dead due to hunger."""
-        return self.hungry >= 3
-
-    def breed(self):
-        """Check if the zebra can breed."""
-        if self.age >= 3:
-            self.age = 0
-            return Zebra(self.x, self.y)
-        return None
-
 class Lion(Animal):
     """A lion in the ecosystem."""
-    def move(self, ecosys):
+    __slots__ = ()
+    species = LION
+    max_hunger = 5
+    breed_age = 5
+
+    def move(self, ecosys, rand):
         """Move the lion to a neighboring cell with a zebra."""
-        prey = [(nx,ny) for nx,ny in self.neighbors()
-                if any(isinstance(a, Zebra) for a in ecosys.animals_at(nx,ny))]
-        if prey:
-            nx, ny = random.choice(prey)
-            victim = next(a for a in ecosys.animals_at(nx,ny) if isinstance(a, Zebra))
-            victim.alive = False
+        x, y = self.x, self.y
+        state = ecosys.state
+        prey_mask = empty_mask = 0
+        for bit, _, _, j in _NBR[y*GRID_SIZE + x]:
+            cell = state[j]
+            if not cell & OCCUPIED:
+                empty_mask |= bit
+            elif cell & ZEBRA:
+                prey_mask |= bit
+        if prey_mask:
+            dx, dy = _pick(prey_mask, rand)
+            nx, ny = x + dx, y + dy
+            victim = next(a for a in ecosys.occ[ny*GRID_SIZE + nx] if a.species == ZEBRA)
+            ecosys.kill(victim)
             ecosys.move(self, nx, ny)
             return True
-        empties = [(nx,ny) for nx,ny in self.neighbors() if not ecosys.occupied(nx,ny)]
-        if empties:
-            nx, ny = random.choice(empties)
-            ecosys.move(self, nx, ny)
+        if empty_mask:
+            dx, dy = _pick(empty_mask, rand)
+            ecosys.move(self, x + dx, y + dy)
         return False
 
-    def dead(self):
-        """Check if the lion is dead due to hunger."""
-        return self.hungry >= 5
-
-    def breed(self):
-        """Check if the lion can breed."""
-        if self.age >= 5:
-            self.age = 0
-            return Lion(self.x, self.y)
-        return None
-
 class Ecosystem:
     """The ecosystem containing grid and animals."""
-    def __init__(self):
+    def __init__(self, seed=None):
         """Initialize the ecosystem with a grid and animals."""
-        self.cells = [[Cell() for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        self.rng = random.Random(seed)
+        # Row-major state grid of GRASS/ZEBRA/LION bits, grass everywhere.
+        self.state = bytearray(bytes([GRASS]) * (GRID_SIZE*GRID_SIZE))
+        self.regrow = bytearray(GRID_SIZE*GRID_SIZE)
+        self._eaten = []  # Flat indices of cells whose grass is regrowing.
+        self._deaths = 0  # Animals killed since the species lists were compacted.
+        self._last_frame = None  # Grid glyphs last drawn by display().
         self.zebras = []
         self.lions = []
+        # Row-major occupancy grid: the animals standing in each cell,
+        # kept in step with the ZEBRA/LION bits of self.state.
+        self.occ = [[] for _ in range(GRID_SIZE*GRID_SIZE)]
         self._populate()
 
-    @property
-    def animals(self):
-        """Return a list of all animals in the ecosystem."""
-        return [*self.zebras, *self.lions]
-
     def _populate(self):
         """Populate the ecosystem with initial zebras and lions."""
         coords = [(x,y) for x in range(GRID_SIZE) for y in range(GRID_SIZE)]
-        random.shuffle(coords)
+        self.rng.shuffle(coords)
         for _ in range(INITIAL_ZEBRAS):
             x,y = coords.pop()
             self.zebras.append(Zebra(x,y))
+            self.place(self.zebras[-1])
         for _ in range(INITIAL_LIONS):
             x,y = coords.pop()
             self.lions.append(Lion(x,y))
+            self.place(self.lions[-1])
 
     def occupied(self, x, y):
         """Check if a cell at (x, y) is occupied by an animal."""
-        return any(a.alive and a.x==x and a.y==y for a in self.animals)
+        return bool(self.state[y*GRID_SIZE + x] & OCCUPIED)
 
     def animals_at(self, x, y):
         """Return a list of animals at the cell (x, y)."""
-        return [a for a in self.animals if a.alive and a.x==x and a.y==y]
+        return self.occ[y*GRID_SIZE + x]
+
+    def place(self, animal):
+        """Register an animal in the occupancy grid at its position."""
+        i = animal.y*GRID_SIZE + animal.x
+        self.occ[i].append(animal)
+        self.state[i] |= animal.species
+
+    def vacate(self, animal):
+        """Remove an animal from the occupancy grid at its position."""
+        i = animal.y*GRID_SIZE + animal.x
+        cell = self.occ[i]
+        cell.remove(animal)
+        species = animal.species
+        if not any(a.species == species for a in cell):
+            self.state[i] &= ~species
+
+    def kill(self, animal):
+        """Mark an animal dead and take it off the grid."""
+        animal.alive = False
+        self.vacate(animal)
+        self._deaths += 1
+
+    def eat_grass(self, x, y):
+        """A zebra eats the grass in the cell (x, y)."""
+        i = y*GRID_SIZE + x
+        self.state[i] &= ~GRASS
+        self.regrow[i] = 1
+        self._eaten.append(i)
 
     def move(self, animal, nx, ny):
         """Move an animal to a new position (nx, ny)."""
+        self.vacate(animal)
         animal.x, animal.y = nx, ny
+        self.place(animal)
 
     def step(self):
         """Perform a step in the ecosystem."""
-        newborns = []
-        for a in list(self.animals):
-            a.step(self, newborns)
-        self.zebras = [z for z in self.zebras if z.alive]
-        self.lions = [l for l in self.lions if l.alive]
-        for baby in newborns:
-            if isinstance(baby, Zebra): self.zebras.append(baby)
-            else: self.lions.append(baby)
-        for row in self.cells:
-            for cell in row:
-                cell.step()
+        rand = self.rng.random
+        zebra_babies, lion_babies = [], []
+        for herd, newborns in ((self.zebras, zebra_babies), (self.lions, lion_babies)):
+            for a in herd:
+                if a.alive:
+                    a.step(self, newborns, rand)
+                    if not a.alive:
+                        self.kill(a)
+        if self._deaths:
+            self.zebras = [z for z in self.zebras if z.alive]
+            self.lions = [l for l in self.lions if l.alive]
+            self._deaths = 0
+        self.zebras += zebra_babies
+        self.lions += lion_babies
+        for baby in zebra_babies + lion_babies:
+            self.place(baby)
+        # Regrow eaten grass, visiting only the cells that were grazed.
+        state, regrow = self.state, self.regrow
+        bare = []
+        for i in self._eaten:
+            regrow[i] -= 1
+            if regrow[i] <= 0:
+                state[i] |= GRASS
+            else:
+                bare.append(i)
+        self._eaten = bare
 
     def stats(self):
         """Return the current statistics of zebras and lions."""
@@ -206,23 +263,17 @@ class Ecosystem:
 
     def display(self, year):
         """Display the current state of the ecosystem."""
-        try:
-            os.system('cls' if os.name=='nt' else 'clear')
-        except Exception:
-            pass
-        col_head = '  ' + ''.join(f'{i:3}' for i in range(1, GRID_SIZE+1))
-        print(col_head)
-        print('-' * len(col_head))
-        for y in range(GRID_SIZE):
-            row = []
-            for x in range(GRID_SIZE):
-                if any(z.x==x and z.y==y for z in self.zebras):
-                    row.append('Z  ')
-                elif any(l.x==x and l.y==y for l in self.lions):
-                    row.append('L  ')
-                else:
-                    row.append('.  ')
-            print(f'{y+1:2}|{"".join(row)}|')
+        frame = bytes(self.state.translate(_GLYPHS))
+        # Only repaint the grid when an animal has moved, been born or died.
+        if frame != self._last_frame:
+            self._last_frame = frame
+            cells = frame.decode('ascii')
+            lines = [_COL_HEAD, _SEP]
+            for y in range(GRID_SIZE):
+                row = cells[y*GRID_SIZE:(y+1)*GRID_SIZE]
+                lines.append(_ROW_PREFIX[y] + '  '.join(row) + '  |')
+            # ANSI clear screen and cursor home instead of spawning a shell.
+            sys.stdout.write('\x1b[2J\x1b[H' + '\n'.join(lines) + '\n')
 
         zs, ls = self.stats()
         print(f'Zebras: {zs} | Lions: {ls} | time step = {year}')
@@ -236,6 +287,8 @@ class Ecosystem:
 
 
 if __name__ == '__main__':
+    if os.name == 'nt':
+        os.system('')  # Turns on ANSI escape handling in the Windows console.
     eco = Ecosystem()
     for year in range(1, YEARS+1):
         eco.step()